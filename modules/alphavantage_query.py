@@ -1,8 +1,15 @@
 
 import os
+import asyncio
+import aiohttp
+import orjson
 import pandas as pd
 import requests
 from enum import StrEnum
+from typing import ClassVar, Optional
+from urllib.parse import quote_plus, urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 class AlphavantageFunction(StrEnum):
     '''
@@ -14,6 +21,12 @@ class AlphavantageFunction(StrEnum):
     Wgt_Moving_avg = "WMA"
 
 class AlphavantageQuery:
+    # Shared by every query so repeated requests reuse pooled keep-alive connections
+    _session: ClassVar[Optional[requests.Session]] = None
+    # Fixed shape of the common intraday query, filled in one pass by build()
+    _INTRADAY_TEMPLATE: ClassVar[str] = "{base}?function={function}&symbol={symbol}&interval={interval}&apikey={apikey}"
+    _INTRADAY_KEYS: ClassVar[frozenset] = frozenset({"function", "symbol", "interval", "apikey"})
+
     def __init__(self, api_key, url_base):
         '''
         Initialize the AlphavantageQuery class. Used with the Alphavantage API.
@@ -25,17 +38,36 @@ class AlphavantageQuery:
             None
         '''
         self.api_key = api_key
-        self.target_url = url_base
+        self.url_base = url_base
+        self.params: dict[str, str] = {}
         self.function = None
         self.symbol = None
         self.interval = None
+
+    @property
+    def target_url(self):
+        '''
+        The full request url, built from the base url and the current parameters.
+        '''
+        return self.build()
+
+    def build(self):
+        '''
+        Build the request url. Queries with exactly function/symbol/interval/apikey
+        use the precompiled template; anything else is urlencoded. Values are
+        quoted the same way on both paths.
+        '''
+        if self.params.keys() == self._INTRADAY_KEYS:
+            quoted = {key: quote_plus(str(value)) for key, value in self.params.items()}
+            return self._INTRADAY_TEMPLATE.format_map({"base": self.url_base, **quoted})
+        return f"{self.url_base}?{urlencode(self.params)}"
     #region url building
     def add_function_to_url(self, function: AlphavantageFunction):
         '''
         Add the function to the url.
         '''
         self.function = function
-        self.target_url = f"{self.target_url}?function={function.value}"
+        self.params["function"] = str(function)
         return self
 
     def add_symbol_to_url(self, symbol):
@@ -43,7 +75,7 @@ class AlphavantageQuery:
         Add the symbol to the url.
         '''
         self.symbol = symbol
-        self.target_url = f"{self.target_url}&symbol={symbol}"
+        self.params["symbol"] = symbol
         return self
 
     def add_interval_to_url(self, interval):
@@ -51,14 +83,14 @@ class AlphavantageQuery:
         Add the interval to the url.
         '''
         self.interval = interval
-        self.target_url = f"{self.target_url}&interval={interval}"
+        self.params["interval"] = interval
         return self
 
     def add_api_key_to_url(self, api_key):
         '''
         Add the api key to the url.
         '''
-        self.target_url = f"{self.target_url}&apikey={api_key}"
+        self.params["apikey"] = api_key
         return self
     #endregion
     #region url modification
@@ -66,44 +98,89 @@ class AlphavantageQuery:
         '''
         Alter the function parameter of the url.
         '''
-        self.function = function
-        self.target_url = self.target_url.replace(f"function={self.function}", f"function={function}")
-        return self
+        return self.add_function_to_url(function)
     
     def alter_url_symbol(self, symbol):
         '''
         Alter the symbol parameter of the url.
         '''
-        self.symbol = symbol
-        self.target_url = self.target_url.replace(f"symbol={self.symbol}", f"symbol={symbol}")
-        return self
+        return self.add_symbol_to_url(symbol)
 
     def alter_url_interval(self, interval):
         '''
         Alter the interval parameter of the url.
         '''
-        self.interval = interval
-        self.target_url = self.target_url.replace(f"interval={self.interval}", f"interval={interval}")
-        return self  
+        return self.add_interval_to_url(interval)
     #endregion
     
     def print_target_url(self):
         print(self.target_url)
         return self
 
+    @staticmethod
+    async def fetch(session, url):
+        '''
+        Get the data from a url using an existing aiohttp session.
+        Args:
+            session: An open aiohttp.ClientSession.
+            url: The url to request.
+        Returns:
+            The decoded json response.
+        '''
+        async with session.get(url) as response:
+            return orjson.loads(await response.read())
+
+    @classmethod
+    async def fetch_many(cls, urls):
+        '''
+        Get the data from many urls concurrently over one pooled session.
+        Args:
+            urls: The urls to request.
+        Returns:
+            A list of decoded json responses, in the same order as urls.
+        '''
+        connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await asyncio.gather(*(cls.fetch(session, url) for url in urls))
+
     async def async_get_data(self):
         '''
         Get the data from the url asynchronously.
         '''
         async with aiohttp.ClientSession() as session:
-            async with session.get(self.target_url) as response:
-                return await response.json()
+            return await self.fetch(session, self.target_url)
+
+    @classmethod
+    def _get_session(cls):
+        '''
+        Get the shared requests session, creating it on first use.
+        '''
+        if cls._session is None:
+            session = requests.Session()
+            retry_strategy = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+            session.mount("https://", HTTPAdapter(max_retries=retry_strategy, pool_maxsize=50))
+            cls._session = session
+        return cls._session
+
+    @classmethod
+    def close_session(cls):
+        '''
+        Close the shared requests session.
+        '''
+        if cls._session is not None:
+            cls._session.close()
+            cls._session = None
 
     def get_data(self):
         '''
         Get the data from the url synchronously.
         '''
-        return requests.get(self.target_url).json()
+        response = self._get_session().get(self.target_url, timeout=30)
+        return orjson.loads(response.content)
 
     def write_to_parquet(self, path):
         df = pd.DataFrame(self.get_data())
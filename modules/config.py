@@ -0,0 +1,10 @@
+# Environment configuration, loaded once on import.
+import os
+from dotenv import load_dotenv
+from constants.urls import ALPHAVANTAGE_URL_BASE
+
+load_dotenv()
+
+API_KEY = os.getenv('ALPHAVANTAGE_API_KEY')
+URL_BASE = os.getenv('ALPHAVANTAGE_URL_BASE', ALPHAVANTAGE_URL_BASE)
+DATA_PATH = os.getenv('DATA_PATH')
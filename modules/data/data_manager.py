@@ -1,6 +1,8 @@
 from typing import Dict, Any, Optional, List
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+import pandas as pd
 
 # Handle both relative and absolute imports
 try:
@@ -31,7 +33,9 @@ class DataManager:
     def remove_source(self, name: str) -> None:
         """Remove a data source"""
         if name in self.sources:
-            del self.sources[name]
+            source = self.sources.pop(name)
+            if hasattr(source, "close"):
+                source.close()
             self.logger.info(f"Removed data source: {name}")
     
     def get_source(self, name: str) -> Optional[DataSource]:
@@ -42,22 +46,25 @@ class DataManager:
         """List available data sources"""
         return list(self.sources.keys())
     
-    def fetch_and_store(self, symbol: str, source_name: str, function: str = "NEWS_SENTIMENT", 
-                       subdirectory: str = "company_sentiment", **kwargs) -> str:
-        """Fetch data from source and store it"""
+    def _fetch(self, symbol: str, source_name: str, function: str, **kwargs) -> Dict[str, Any]:
+        """Fetch raw data for a symbol from a named source"""
         if source_name not in self.sources:
             raise ValueError(f"Data source {source_name} not found")
         
         source = self.sources[source_name]
         
+        # Check if source is available
+        if not source.is_available():
+            raise Exception(f"Data source {source_name} is not available")
+        
+        self.logger.info(f"Fetching data for {symbol} from {source_name}")
+        return source.fetch_data(symbol, function=function, **kwargs)
+    
+    def fetch_and_store(self, symbol: str, source_name: str, function: str = "NEWS_SENTIMENT", 
+                       subdirectory: str = "company_sentiment", **kwargs) -> str:
+        """Fetch data from source and store it"""
         try:
-            # Check if source is available
-            if not source.is_available():
-                raise Exception(f"Data source {source_name} is not available")
-            
-            # Fetch data
-            self.logger.info(f"Fetching data for {symbol} from {source_name}")
-            data = source.fetch_data(symbol, function=function, **kwargs)
+            data = self._fetch(symbol, source_name, function, **kwargs)
             
             # Store data
             filename = f"{symbol}_{function}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -70,35 +77,106 @@ class DataManager:
             self.logger.error(f"Failed to fetch and store data for {symbol}: {e}")
             raise
     
+    def fetch_and_store_parquet(self, symbol: str, source_name: str, function: str = "TIME_SERIES_DAILY",
+                                subdirectory: str = "time_series", **kwargs) -> str:
+        """Fetch a time series from source and store it as a Parquet file
+        
+        Read it back with get_latest_frame. Raises ValueError if the response
+        has no "Time Series (...)" section.
+        """
+        try:
+            data = self._fetch(symbol, source_name, function, **kwargs)
+            
+            time_series = self._time_series_frame(data)
+            if time_series is None:
+                raise ValueError(f"{function} response for {symbol} has no time series")
+            
+            filename = f"{symbol}_{function}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            filepath = self.storage.save_parquet(time_series, filename, subdirectory)
+            
+            self.logger.info(f"Data stored at: {filepath}")
+            return filepath
+            
+        except Exception as e:
+            self.logger.error(f"Failed to fetch and store data for {symbol}: {e}")
+            raise
+    
+    @staticmethod
+    def _time_series_frame(data: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """Flatten a "Time Series (...)" response into a numeric DataFrame, if present
+        
+        Shaped like AlphaVantageApi.to_dataframe (clean column names, oldest
+        first), with the timestamps as a column since Parquet files drop the index.
+        """
+        # Imported here so the storage layer doesn't load the HTTP client stack at import time
+        from src.apis.alpha_vantage_api import time_series_frame
+        
+        for key in data:
+            if "Time Series" in key:
+                return time_series_frame(data[key]).rename_axis("timestamp").reset_index()
+        return None
+    
+    def fetch_and_store_many(self, symbols: List[str], source_name: str, function: str = "NEWS_SENTIMENT",
+                             subdirectory: str = "company_sentiment", max_workers: int = 8,
+                             **kwargs) -> Dict[str, str]:
+        """Fetch and store data for several symbols concurrently
+        
+        Returns a mapping of symbol to stored filepath. Symbols that fail are
+        logged and left out of the result so one failure doesn't abort the batch.
+        """
+        results: Dict[str, str] = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch_and_store, symbol, source_name, function, subdirectory, **kwargs): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Batch fetch failed for {symbol}: {e}")
+        
+        return results
+    
     def get_latest_data(self, symbol: str, subdirectory: str = "company_sentiment") -> Optional[Dict[str, Any]]:
         """Get the most recent data for a symbol"""
         try:
-            files = self.storage.list_files(subdirectory, "json")
-            symbol_files = [f for f in files if f.startswith(symbol)]
+            # Filenames end in a _%Y%m%d_%H%M%S timestamp; pick the newest in one pass
+            latest_file = self.storage.latest_matching(subdirectory, symbol, "json")
             
-            if not symbol_files:
+            if latest_file is None:
                 return None
             
-            # Sort by timestamp (assuming filename format includes timestamp)
-            symbol_files.sort(reverse=True)
-            latest_file = symbol_files[0].replace(".json", "")
-            
-            return self.storage.load_json(latest_file, subdirectory)
+            return self.storage.load_json(latest_file.stem, subdirectory)
             
         except Exception as e:
             self.logger.error(f"Failed to get latest data for {symbol}: {e}")
             return None
     
+    def get_latest_frame(self, symbol: str, subdirectory: str = "time_series") -> Optional[pd.DataFrame]:
+        """Get the most recent Parquet time series stored for a symbol"""
+        try:
+            latest_file = self.storage.latest_matching(subdirectory, symbol, "parquet")
+            
+            if latest_file is None:
+                return None
+            
+            return self.storage.load_parquet(latest_file.stem, subdirectory)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get latest frame for {symbol}: {e}")
+            return None
+    
     def get_all_data(self, symbol: str, subdirectory: str = "company_sentiment") -> List[Dict[str, Any]]:
         """Get all data for a symbol"""
         try:
-            files = self.storage.list_files(subdirectory, "json")
-            symbol_files = [f for f in files if f.startswith(symbol)]
+            symbol_files = self.storage.matching_files(subdirectory, symbol, "json")
             
             all_data = []
             for file in symbol_files:
-                filename = file.replace(".json", "")
-                data = self.storage.load_json(filename, subdirectory)
+                data = self.storage.load_json(file.stem, subdirectory)
                 all_data.append(data)
             
             return all_data
@@ -113,11 +191,16 @@ class DataManager:
         return any(f.startswith(symbol) for f in files)
 
 if __name__ == "__main__":
-    import os
-    from dotenv import load_dotenv
+    try:
+        from modules.config import API_KEY
+    except ImportError:
+        # Fallback for direct execution
+        import sys
+        from pathlib import Path
+        sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+        from modules.config import API_KEY
     
-    load_dotenv()
-    api_key = os.getenv('ALPHAVANTAGE_API_KEY')
+    api_key = API_KEY
     
     if api_key:
         data_manager = DataManager(api_key=api_key)
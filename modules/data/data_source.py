@@ -2,8 +2,56 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 import pandas as pd
 import json
+import orjson
 import os
+import threading
 from datetime import datetime
+import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Health checks are shared per base_url across all sources: successes for 60s,
+# failures only briefly so a transient blip doesn't block every fetch for a minute
+_availability_cache = TTLCache(maxsize=4, ttl=60)
+_unavailability_cache = TTLCache(maxsize=4, ttl=5)
+# Concurrent misses wait on this for the one in-flight probe instead of sending their own
+_probe_condition = threading.Condition()
+_probes_in_flight: set = set()
+
+def _head_ok(session: requests.Session, base_url: str) -> bool:
+    """HEAD the base url and report whether it answered 200"""
+    try:
+        response = session.head(base_url, timeout=5, allow_redirects=True)
+        return response.status_code == 200
+    except requests.RequestException:
+        return False
+
+def _probe(session: requests.Session, base_url: str) -> bool:
+    """Cached _head_ok, with at most one probe in flight per base url"""
+    with _probe_condition:
+        while True:
+            if base_url in _availability_cache:
+                return True
+            if base_url in _unavailability_cache:
+                return False
+            if base_url not in _probes_in_flight:
+                break
+            _probe_condition.wait()
+        _probes_in_flight.add(base_url)
+    
+    available = False
+    try:
+        available = _head_ok(session, base_url)
+    finally:
+        with _probe_condition:
+            if available:
+                _availability_cache[base_url] = True
+            else:
+                _unavailability_cache[base_url] = False
+            _probes_in_flight.discard(base_url)
+            _probe_condition.notify_all()
+    return available
 
 class DataSource(ABC):
     """Abstract base class for data sources"""
@@ -24,12 +72,29 @@ class AlphaVantageSource(DataSource):
     def __init__(self, api_key: str, base_url: str = "https://www.alphavantage.co/query"):
         self.api_key = api_key
         self.base_url = base_url
-        self.session = None
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """Create a pooled session so repeated calls reuse keep-alive connections"""
+        session = requests.Session()
+        # Transient 429/5xx responses are retried inside urllib3, honouring Retry-After
+        retry_strategy = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["HEAD", "GET"],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=10,
+            pool_maxsize=50
+        )
+        session.mount("https://", adapter)
+        return session
     
     def fetch_data(self, symbol: str, function: str = "NEWS_SENTIMENT", **kwargs) -> Dict[str, Any]:
         """Fetch data from Alpha Vantage API"""
-        import requests
-        
         params = {
             "function": function,
             "symbol": symbol,
@@ -38,17 +103,17 @@ class AlphaVantageSource(DataSource):
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
+            response = self.session.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch data from Alpha Vantage: {e}")
     
     def is_available(self) -> bool:
-        """Check if Alpha Vantage API is available"""
-        try:
-            import requests
-            response = requests.get(self.base_url, timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        """Check if Alpha Vantage API is available (cached per base url: 60s if up, 5s if down)"""
+        return _probe(self.session, self.base_url)
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        if self.session:
+            self.session.close()
@@ -1,66 +1,83 @@
 import json
+import orjson
 import pandas as pd
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
 from pathlib import Path
 
 class DataStorage:
     """Handles data storage and retrieval for JSON and Parquet formats"""
     
-    def __init__(self, base_path: str = "data"):
-        self.base_path = Path(base_path)
-        self.base_path.mkdir(exist_ok=True)
+    def __init__(self, base_path: Union[str, Path] = "data"):
+        self.base_path = base_path if isinstance(base_path, Path) else Path(base_path)
+        if not self.base_path.is_dir():
+            self.base_path.mkdir(exist_ok=True)
+        # Subdirectories already created this session, keyed by name
+        self._subdirs: Dict[str, Path] = {"": self.base_path}
     
-    def save_json(self, data: Dict[str, Any], filename: str, subdirectory: str = "") -> str:
-        """Save data as JSON file"""
-        if subdirectory:
+    def _ensure_subdir(self, subdirectory: str = "") -> Path:
+        """Return the path for a subdirectory, creating it on first use"""
+        path = self._subdirs.get(subdirectory)
+        if path is None:
             path = self.base_path / subdirectory
-            path.mkdir(exist_ok=True)
-        else:
-            path = self.base_path
+            path.mkdir(parents=True, exist_ok=True)
+            self._subdirs[subdirectory] = path
+        return path
+    
+    def _subdir_path(self, subdirectory: str = "") -> Path:
+        """Return the path for a subdirectory without touching the filesystem"""
+        path = self._subdirs.get(subdirectory)
+        if path is None:
+            path = self.base_path / subdirectory
+        return path
+    
+    def save_json(self, data: Dict[str, Any], filename: str, subdirectory: str = "",
+                  indent: Optional[int] = None) -> str:
+        """Save data as JSON file (compact unless an indent is given)"""
+        path = self._ensure_subdir(subdirectory)
         
         filepath = path / f"{filename}.json"
+        # Write to a temp file and rename so readers never see a partial file
+        tmp = filepath.with_suffix(filepath.suffix + ".tmp")
         
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        if indent is None:
+            with open(tmp, "wb") as f:
+                f.write(orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(tmp, "w") as f:
+                json.dump(data, f, indent=indent, default=str)
+        os.replace(tmp, filepath)
         
         return str(filepath)
     
     def load_json(self, filename: str, subdirectory: str = "") -> Dict[str, Any]:
         """Load data from JSON file"""
-        if subdirectory:
-            path = self.base_path / subdirectory
-        else:
-            path = self.base_path
+        path = self._subdir_path(subdirectory)
         
         filepath = path / f"{filename}.json"
         
         if not filepath.exists():
             raise FileNotFoundError(f"File not found: {filepath}")
         
-        with open(filepath, "r") as f:
-            return json.load(f)
+        with open(filepath, "rb") as f:
+            return orjson.loads(f.read())
     
-    def save_parquet(self, df: pd.DataFrame, filename: str, subdirectory: str = "") -> str:
+    def save_parquet(self, df: pd.DataFrame, filename: str, subdirectory: str = "",
+                     compression: str = "zstd") -> str:
         """Save DataFrame as Parquet file"""
-        if subdirectory:
-            path = self.base_path / subdirectory
-            path.mkdir(exist_ok=True)
-        else:
-            path = self.base_path
+        path = self._ensure_subdir(subdirectory)
         
         filepath = path / f"{filename}.parquet"
-        df.to_parquet(filepath, index=False)
+        tmp = filepath.with_suffix(filepath.suffix + ".tmp")
+        df.to_parquet(tmp, engine="pyarrow", compression=compression, index=False)
+        os.replace(tmp, filepath)
         
         return str(filepath)
     
     def load_parquet(self, filename: str, subdirectory: str = "") -> pd.DataFrame:
         """Load DataFrame from Parquet file"""
-        if subdirectory:
-            path = self.base_path / subdirectory
-        else:
-            path = self.base_path
+        path = self._subdir_path(subdirectory)
         
         filepath = path / f"{filename}.parquet"
         
@@ -71,28 +88,31 @@ class DataStorage:
     
     def list_files(self, subdirectory: str = "", extension: str = None) -> List[str]:
         """List files in directory"""
-        if subdirectory:
-            path = self.base_path / subdirectory
-        else:
-            path = self.base_path
+        path = self._subdir_path(subdirectory)
         
         if not path.exists():
             return []
         
-        files = []
-        for file in path.iterdir():
-            if file.is_file():
-                if extension is None or file.suffix == f".{extension}":
-                    files.append(file.name)
-        
-        return files
+        # scandir's DirEntry caches the file type from readdir, avoiding a stat per file
+        suffix = f".{extension}" if extension else None
+        with os.scandir(path) as entries:
+            return [
+                entry.name for entry in entries
+                if entry.is_file() and (suffix is None or entry.name.endswith(suffix))
+            ]
+    
+    def matching_files(self, subdirectory: str, prefix: str, extension: str = "json") -> List[Path]:
+        """List files named "{prefix}_*.{extension}" in a subdirectory"""
+        return list(self._subdir_path(subdirectory).glob(f"{prefix}_*.{extension}"))
+    
+    def latest_matching(self, subdirectory: str, prefix: str, extension: str = "json") -> Optional[Path]:
+        """Return the newest "{prefix}_*.{extension}" file by its trailing _%Y%m%d_%H%M%S stamp"""
+        return max(self._subdir_path(subdirectory).glob(f"{prefix}_*.{extension}"),
+                   default=None, key=lambda p: p.stem.rsplit("_", 2)[-2:])
     
     def file_exists(self, filename: str, subdirectory: str = "") -> bool:
         """Check if file exists"""
-        if subdirectory:
-            path = self.base_path / subdirectory
-        else:
-            path = self.base_path
+        path = self._subdir_path(subdirectory)
         
         filepath = path / filename
         return filepath.exists()
@@ -0,0 +1,211 @@
+"""
+File-based result cache for API wrappers
+
+Stores results under {root}/[{subdir}/]{ticker}/{endpoint}_{md5(args)}.pkl (or
+.json) and treats entries older than the TTL as misses.
+"""
+
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import tempfile
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+import orjson
+
+from src.config.settings import DataConfig
+
+
+# Type variable for generic return types
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+
+class FileCache:
+    """
+    On-disk cache of API results with a time-to-live
+    
+    Freshness is judged by file modification time, so no sidecar metadata
+    is needed.
+    """
+    
+    def __init__(self, root: Path, ttl_hours: float = 24):
+        """
+        Initialize file cache
+        
+        Args:
+            root: Directory to store cache entries under
+            ttl_hours: Hours before an entry is considered stale
+        """
+        self.root = Path(root)
+        self.ttl_hours = ttl_hours
+    
+    @classmethod
+    def from_config(cls, data: DataConfig, namespace: str) -> Optional["FileCache"]:
+        """
+        Build a cache from data settings
+        
+        Args:
+            data: Data configuration (cache_enabled, cache_ttl_hours, root_dir)
+            namespace: Subdirectory for this API (e.g., 'yahoo')
+        
+        Returns:
+            FileCache under {root_dir}/.cache/{namespace}, or None if caching is disabled
+        """
+        if not data.cache_enabled:
+            return None
+        return cls(data.root_dir / ".cache" / namespace, ttl_hours=data.cache_ttl_hours)
+    
+    def path_for(
+        self,
+        ticker: str,
+        endpoint: str,
+        key: str,
+        subdir: Optional[str] = None,
+        suffix: str = ".pkl"
+    ) -> Path:
+        """Get the file path for a cache entry (.json entries are stored as JSON)"""
+        root = self.root / subdir if subdir else self.root
+        return root / ticker / f"{endpoint}_{key}{suffix}"
+    
+    def get(self, path: Path, ttl_hours: Optional[float] = None) -> Optional[Any]:
+        """
+        Load a cache entry
+        
+        Args:
+            path: Entry path from path_for
+            ttl_hours: Override the cache-wide TTL for this lookup
+        
+        Returns:
+            The cached value, or None if missing or older than the TTL
+        """
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        
+        ttl = self.ttl_hours if ttl_hours is None else ttl_hours
+        if age > ttl * 3600:
+            return None
+        
+        with open(path, "rb") as f:
+            data = f.read()
+        return orjson.loads(data) if path.suffix == ".json" else pickle.loads(data)
+    
+    def set(self, path: Path, value: Any) -> None:
+        """Store a cache entry atomically, so concurrent readers never see a partial file"""
+        if path.suffix == ".json":
+            data = orjson.dumps(value, default=str)
+        else:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name per writer, renamed over the entry in one step
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _is_empty(value: Any) -> bool:
+    """Check whether a result is empty and should not be cached"""
+    if value is None:
+        return True
+    try:
+        return len(value) == 0
+    except TypeError:
+        return False
+
+
+def cached(
+    endpoint: str,
+    ttl_hours: Optional[float] = None,
+    cache_subdir: Optional[str] = None,
+    serializer: str = "pickle",
+    serve_stale: bool = False,
+    max_stale_hours: float = 72
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator to cache a method's result in the instance's FileCache
+    
+    The method must belong to a class with a `cache` attribute holding a
+    FileCache (or None to disable caching). Its first argument after self
+    is used as the ticker directory, and the cache key is built from all
+    bound arguments, defaults included. Empty results are not cached.
+    
+    Args:
+        endpoint: Name used in the entry's file name
+        ttl_hours: TTL for this endpoint (defaults to the cache's TTL)
+        cache_subdir: Directory under the cache root for this endpoint
+        serializer: "pickle", or "json" for JSON-safe results such as dicts
+        serve_stale: If a refresh comes back empty, return an expired entry
+            instead (only for data where an old answer beats none)
+        max_stale_hours: Oldest entry serve_stale may return
+    
+    Usage:
+        @cached("intraday")
+        def get_intraday_data(self, ticker, period="5d", interval="1m"):
+            # Your code here
+    """
+    if serializer not in ("pickle", "json"):
+        raise ValueError(f"Unsupported serializer: {serializer}")
+    suffix = ".json" if serializer == "json" else ".pkl"
+    
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        def wrapper(self, *args, **kwargs) -> T:
+            cache: Optional[FileCache] = getattr(self, 'cache', None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            call_args = list(bound.arguments.items())[1:]
+            
+            ticker = str(call_args[0][1]) if call_args else "_"
+            key = hashlib.md5(repr(call_args).encode()).hexdigest()
+            path = cache.path_for(ticker, endpoint, key, subdir=cache_subdir, suffix=suffix)
+            
+            try:
+                value = cache.get(path, ttl_hours)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+                value = None
+            if value is not None:
+                return value
+            
+            value = func(self, *args, **kwargs)
+            
+            if _is_empty(value):
+                if serve_stale:
+                    # Refresh failed; a recent-enough outdated entry beats nothing
+                    try:
+                        stale = cache.get(path, max_stale_hours)
+                    except Exception:
+                        stale = None
+                    if stale is not None:
+                        logger.warning(f"Refresh returned no data; serving stale cache entry {path}")
+                        return stale
+                return value
+            
+            try:
+                cache.set(path, value)
+            except OSError as e:
+                logger.warning(f"Failed to write cache entry {path}: {e}")
+            
+            return value
+        
+        return wrapper
+    
+    return decorator
@@ -23,6 +23,34 @@ class AlphaVantageFunction(StrEnum):
     WMA = "WMA"
 
 
+def _to_numeric_if_possible(column: pd.Series) -> pd.Series:
+    """Convert a column to a numeric dtype, leaving it untouched if that fails"""
+    try:
+        return pd.to_numeric(column)
+    except (ValueError, TypeError):
+        return column
+
+
+def time_series_frame(series: Dict[str, Dict[str, str]]) -> pd.DataFrame:
+    """
+    Convert an Alpha Vantage "Time Series (...)" / "Technical Analysis" section to a DataFrame
+    
+    Args:
+        series: Mapping of timestamp -> {"1. open": "...", ...}
+        
+    Returns:
+        Numeric frame indexed by datetime, oldest first, with the "N. " prefixes
+        stripped from column names ("1. open" -> "open")
+    """
+    df = pd.DataFrame(series).T
+    df.index = pd.to_datetime(df.index)
+    # Values arrive as strings; convert once so the frame is float-backed
+    df = df.apply(_to_numeric_if_possible)
+    # "1. open" -> "open"
+    df.columns = [col.split(". ", 1)[-1] for col in df.columns]
+    return df.sort_index()
+
+
 class AlphaVantageApi(BaseAPI):
     """
     Alpha Vantage API client
@@ -251,9 +279,7 @@ class AlphaVantageApi(BaseAPI):
         # Try to find time series data
         for k in data.keys():
             if "Time Series" in k or "Technical" in k:
-                df = pd.DataFrame(data[k]).T
-                df.index = pd.to_datetime(df.index)
-                return df
+                return time_series_frame(data[k])
         
         # If no time series found, convert whole response
         return pd.DataFrame(data)
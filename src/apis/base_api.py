@@ -5,13 +5,20 @@ Provides common utilities for rate limiting, retries, error handling, and loggin
 Uses composition over strict inheritance - API classes can use these utilities as needed.
 """
 
+import os
 import time
+import random
 import logging
+import threading
+from collections import deque
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, Callable, TypeVar
 from datetime import datetime, timedelta
 from functools import wraps
+from pathlib import Path
+import orjson
 import requests
+import requests_cache
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -21,6 +28,10 @@ from src.config.settings import APIConfig, RateLimitConfig
 # Type variable for generic return types
 T = TypeVar('T')
 
+# Credential params/headers never written to the HTTP cache (requests-cache's defaults);
+# each API's own key params are added on top
+_CACHE_IGNORED_PARAMS = ("Authorization", "X-API-KEY", "access_token", "api_key")
+
 
 class RateLimiter:
     """
@@ -37,92 +48,155 @@ class RateLimiter:
             config: Rate limit configuration
         """
         self.config = config
-        self.minute_calls: list[float] = []
-        self.day_calls: list[float] = []
+        self.minute_calls: deque[float] = deque()
+        # Per-day usage is counted in 1-minute buckets: [bucket index, calls], oldest first
+        self.day_buckets: deque[list[int]] = deque()
+        self.day_total = 0
         self.last_call_time: Optional[float] = None
+        # Guards all window state so threaded callers see consistent counts
+        self._lock = threading.Lock()
         
         self.logger = logging.getLogger(f"{__name__}.RateLimiter")
     
-    def wait_if_needed(self) -> None:
+    def wait_if_needed(self, now: Optional[float] = None) -> float:
         """
-        Wait if necessary to comply with rate limits
+        Wait if necessary to comply with rate limits, then reserve a call slot
         
         Checks both per-minute and per-day limits, and enforces minimum delay.
+        The slot is recorded under the same lock as the checks, so concurrent
+        callers can't all pass the check before any of them is counted; don't
+        also call record_call() for it. Waiting happens outside the lock.
+        
+        Args:
+            now: Current time.monotonic() reading, if the caller already has one
+            
+        Returns:
+            The monotonic time the slot was reserved at
         """
-        current_time = time.time()
-        
-        # Enforce minimum delay between calls
-        if self.last_call_time:
-            time_since_last = current_time - self.last_call_time
-            if time_since_last < self.config.min_delay_seconds:
-                wait_time = self.config.min_delay_seconds - time_since_last
-                self.logger.debug(f"Waiting {wait_time:.2f}s for minimum delay")
-                time.sleep(wait_time)
-                current_time = time.time()
-        
-        # Clean up old minute calls (keep only last 60 seconds)
-        minute_ago = current_time - 60
-        self.minute_calls = [t for t in self.minute_calls if t > minute_ago]
-        
-        # Check per-minute limit
-        if len(self.minute_calls) >= self.config.calls_per_minute:
-            # Need to wait until the oldest call falls out of the window
-            oldest_call = self.minute_calls[0]
-            wait_time = 60 - (current_time - oldest_call) + 0.1  # Add small buffer
-            if wait_time > 0:
+        current_time = time.monotonic() if now is None else now
+        
+        while True:
+            # Sleep outside the lock so other threads (and get_stats) aren't
+            # blocked, then re-check: another caller may have taken the slot
+            wait_time = self._reserve_or_wait_time(current_time)
+            if wait_time is None:
+                return current_time
+            time.sleep(wait_time)
+            current_time = time.monotonic()
+    
+    def _reserve_or_wait_time(self, current_time: float) -> Optional[float]:
+        """
+        Reserve a slot at current_time if the limits allow it
+        
+        Returns:
+            None once the slot is reserved, otherwise the seconds to wait before retrying
+            
+        Raises:
+            RateLimitException: If the daily limit is exhausted
+        """
+        with self._lock:
+            # Enforce minimum delay between calls
+            if self.last_call_time is not None:
+                time_since_last = current_time - self.last_call_time
+                if time_since_last < self.config.min_delay_seconds:
+                    wait_time = self.config.min_delay_seconds - time_since_last
+                    self.logger.debug(f"Waiting {wait_time:.2f}s for minimum delay")
+                    return wait_time
+            
+            # Clean up old minute calls (keep only last 60 seconds)
+            self._prune_minute_calls(current_time)
+            
+            # Check per-minute limit
+            if len(self.minute_calls) >= self.config.calls_per_minute:
+                # Need to wait until the oldest call falls out of the window
+                oldest_call = self.minute_calls[0]
+                wait_time = 60 - (current_time - oldest_call) + 0.1  # Add small buffer
                 self.logger.info(
                     f"Rate limit: {len(self.minute_calls)}/{self.config.calls_per_minute} "
                     f"calls in last minute. Waiting {wait_time:.1f}s"
                 )
-                time.sleep(wait_time)
-                current_time = time.time()
-                # Clean up again after waiting
-                minute_ago = current_time - 60
-                self.minute_calls = [t for t in self.minute_calls if t > minute_ago]
-        
-        # Check per-day limit (if configured)
-        if self.config.calls_per_day:
-            # Clean up old day calls (keep only last 24 hours)
-            day_ago = current_time - (24 * 60 * 60)
-            self.day_calls = [t for t in self.day_calls if t > day_ago]
+                return wait_time
             
-            if len(self.day_calls) >= self.config.calls_per_day:
-                # Calculate wait time until oldest call falls out of 24h window
-                oldest_call = self.day_calls[0]
-                wait_time = (24 * 60 * 60) - (current_time - oldest_call) + 1
-                self.logger.warning(
-                    f"Daily rate limit reached: {len(self.day_calls)}/{self.config.calls_per_day} "
-                    f"calls in last 24h. Would need to wait {wait_time/3600:.1f} hours"
-                )
-                raise RateLimitException(
-                    f"Daily rate limit of {self.config.calls_per_day} calls exceeded. "
-                    f"Wait {wait_time/3600:.1f} hours or upgrade your plan."
-                )
+            # Check per-day limit (if configured)
+            if self.config.calls_per_day:
+                # Clean up old day buckets (keep only last 24 hours)
+                self._prune_day_buckets(current_time)
+                
+                if self.day_total >= self.config.calls_per_day:
+                    # Calculate wait time until the oldest bucket falls out of 24h window
+                    oldest_bucket_end = (self.day_buckets[0][0] + 1) * 60
+                    wait_time = (24 * 60 * 60) - (current_time - oldest_bucket_end) + 1
+                    self.logger.warning(
+                        f"Daily rate limit reached: {self.day_total}/{self.config.calls_per_day} "
+                        f"calls in last 24h. Would need to wait {wait_time/3600:.1f} hours"
+                    )
+                    raise RateLimitException(
+                        f"Daily rate limit of {self.config.calls_per_day} calls exceeded. "
+                        f"Wait {wait_time/3600:.1f} hours or upgrade your plan."
+                    )
+            
+            self._record(current_time)
+            return None
     
-    def record_call(self) -> None:
-        """Record that an API call was made"""
-        current_time = time.time()
+    def record_call(self, now: Optional[float] = None) -> None:
+        """Record an API call that was made without going through wait_if_needed()"""
+        with self._lock:
+            self._record(time.monotonic() if now is None else now)
+    
+    def _record(self, current_time: float) -> None:
+        """Count a call at current_time; the caller must hold the lock"""
         self.minute_calls.append(current_time)
         if self.config.calls_per_day:
-            self.day_calls.append(current_time)
+            bucket = int(current_time // 60)
+            if self.day_buckets and self.day_buckets[-1][0] == bucket:
+                self.day_buckets[-1][1] += 1
+            else:
+                self.day_buckets.append([bucket, 1])
+            self.day_total += 1
         self.last_call_time = current_time
     
+    def _prune_minute_calls(self, current_time: float) -> None:
+        """Drop calls older than 60s; timestamps are appended in order so they sit at the head"""
+        minute_ago = current_time - 60
+        while self.minute_calls and self.minute_calls[0] <= minute_ago:
+            self.minute_calls.popleft()
+    
+    def _prune_day_buckets(self, current_time: float) -> None:
+        """Drop day buckets that have fully left the 24 hour window"""
+        oldest_live = int(current_time // 60) - 24 * 60
+        while self.day_buckets and self.day_buckets[0][0] <= oldest_live:
+            self.day_total -= self.day_buckets.popleft()[1]
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get current rate limiter statistics"""
-        current_time = time.time()
-        minute_ago = current_time - 60
-        day_ago = current_time - (24 * 60 * 60)
-        
-        minute_calls = [t for t in self.minute_calls if t > minute_ago]
-        day_calls = [t for t in self.day_calls if t > day_ago]
-        
-        return {
-            "calls_last_minute": len(minute_calls),
-            "limit_per_minute": self.config.calls_per_minute,
-            "calls_last_day": len(day_calls),
-            "limit_per_day": self.config.calls_per_day,
-            "last_call_ago_seconds": current_time - self.last_call_time if self.last_call_time else None
-        }
+        with self._lock:
+            current_time = time.monotonic()
+            
+            # Prune expired entries in place; the live counts are then O(1) reads
+            self._prune_minute_calls(current_time)
+            self._prune_day_buckets(current_time)
+            
+            return {
+                "calls_last_minute": len(self.minute_calls),
+                "limit_per_minute": self.config.calls_per_minute,
+                "calls_last_day": self.day_total,
+                "limit_per_day": self.config.calls_per_day,
+                "last_call_ago_seconds": current_time - self.last_call_time if self.last_call_time is not None else None
+            }
+
+
+class JitterRetry(Retry):
+    """
+    urllib3 Retry with randomized backoff
+    
+    Stretches each exponential backoff by up to 50% so clients that fail
+    together don't all retry on the same schedule.
+    """
+    
+    def get_backoff_time(self) -> float:
+        base = super().get_backoff_time()
+        backoff_max = getattr(self, "backoff_max", Retry.DEFAULT_BACKOFF_MAX)
+        return min(base * (1 + random.random() * 0.5), backoff_max)
 
 
 class RateLimitException(Exception):
@@ -144,19 +218,36 @@ class BaseAPI(ABC):
     - Retry logic with exponential backoff
     - Error handling and logging
     - Session management with connection pooling
+    - Optional on-disk HTTP caching of GET responses
     """
     
-    def __init__(self, config: APIConfig):
+    # Set in subclasses to cache GET responses in a sqlite-backed requests-cache session
+    cache_expire_after: Optional[timedelta] = None
+    # Per-URL-pattern overrides of cache_expire_after
+    cache_urls_expire_after: Dict[str, timedelta] = {}
+    
+    def __init__(self, config: APIConfig, cache_dir: Optional[Path] = None):
         """
         Initialize base API
         
         Args:
             config: API configuration
+            cache_dir: Directory for the HTTP cache when cache_expire_after is set
+                (defaults to {DATA_ROOT_DIR or "data"}/.cache; pass
+                settings.data.root_dir / ".cache" to follow loaded settings)
         """
         self.config = config
+        self.cache_dir = cache_dir
         self.rate_limiter = RateLimiter(config.rate_limit)
         self.logger = logging.getLogger(f"{__name__}.{config.name}")
         
+        # Per-request defaults never change, so build them once
+        self._default_headers = self._get_default_headers()
+        if self.config.api_key and self._should_add_api_key_to_params():
+            self._api_key_params = self._get_api_key_params()
+        else:
+            self._api_key_params = {}
+        
         # Create session with retry logic
         self.session = self._create_session()
         
@@ -166,20 +257,42 @@ class BaseAPI(ABC):
             "successful_calls": 0,
             "failed_calls": 0,
             "retried_calls": 0,
+            "cached_calls": 0,
             "total_wait_time": 0.0
         }
     
     def _create_session(self) -> requests.Session:
         """
-        Create a requests session with retry logic and connection pooling
+        Create a requests session with retry logic, connection pooling,
+        and the default headers / API key params applied to every request
+        
+        Uses a requests-cache CachedSession when cache_expire_after is set.
         
         Returns:
             Configured requests.Session
         """
-        session = requests.Session()
+        if self.cache_expire_after is not None:
+            # Read the env var directly: building Settings here would demand every API's keys
+            cache_dir = self.cache_dir or Path(os.getenv("DATA_ROOT_DIR", "data")) / ".cache"
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            session = requests_cache.CachedSession(
+                cache_name=str(cache_dir / f"{self.config.name}_cache"),
+                backend="sqlite",
+                expire_after=self.cache_expire_after,
+                urls_expire_after=self.cache_urls_expire_after,
+                allowable_methods=("GET",),
+                # Keep API keys out of cache keys and the stored requests
+                ignored_parameters=[*_CACHE_IGNORED_PARAMS, *self._api_key_params]
+            )
+        else:
+            session = requests.Session()
+        
+        # Session-level defaults are merged into every request by requests itself
+        session.headers.update(self._default_headers)
+        session.params = dict(self._api_key_params)
         
         # Configure retries for connection errors and server errors (5xx)
-        retry_strategy = Retry(
+        retry_strategy = JitterRetry(
             total=self.config.max_retries,
             backoff_factor=self.config.retry_delay,
             status_forcelist=[429, 500, 502, 503, 504],
@@ -188,8 +301,8 @@ class BaseAPI(ABC):
         
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=20
+            pool_connections=50,
+            pool_maxsize=100
         )
         
         session.mount("http://", adapter)
@@ -229,26 +342,23 @@ class BaseAPI(ABC):
         if not self.config.enabled:
             raise APIException(f"API {self.config.name} is disabled in configuration")
         
-        # Wait for rate limiting
-        start_wait = time.time()
-        self.rate_limiter.wait_if_needed()
-        wait_time = time.time() - start_wait
-        self.stats["total_wait_time"] += wait_time
-        
-        # Add API key to request if needed
-        if params is None:
-            params = {}
-        if self.config.api_key and self._should_add_api_key_to_params():
-            params = {**params, **self._get_api_key_params()}
+        # Fresh cache hits are answered from sqlite without touching the rate limiter
+        if method.upper() == "GET" and isinstance(self.session, requests_cache.CachedSession):
+            cached = self._cached_response(url, params=params, headers=headers, **kwargs)
+            if cached is not None:
+                self.stats["total_calls"] += 1
+                self.stats["cached_calls"] += 1
+                self.stats["successful_calls"] += 1
+                return cached
         
-        # Merge headers
-        request_headers = self._get_default_headers()
-        if headers:
-            request_headers.update(headers)
+        # Wait for rate limiting; this also reserves the call's slot
+        start_wait = time.monotonic()
+        self.stats["total_wait_time"] += self.rate_limiter.wait_if_needed(start_wait) - start_wait
         
         # Make request
         try:
-            self.logger.debug(f"{method} {url} with params={params}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"{method} {url} with params={params}")
             
             response = self.session.request(
                 method=method,
@@ -256,19 +366,19 @@ class BaseAPI(ABC):
                 params=params,
                 data=data,
                 json=json,
-                headers=request_headers,
+                headers=headers,
                 timeout=self.config.timeout,
                 **kwargs
             )
             
-            # Record successful call
-            self.rate_limiter.record_call()
             self.stats["total_calls"] += 1
             
             # Check response
             if response.status_code >= 400:
                 self.stats["failed_calls"] += 1
-                error_msg = f"API error {response.status_code}: {response.text[:200]}"
+                # Slice the bytes before decoding rather than decoding the whole body
+                body = response.content[:200].decode("utf-8", errors="replace")
+                error_msg = f"API error {response.status_code}: {body}"
                 self.logger.error(error_msg)
                 raise APIException(error_msg)
             
@@ -289,6 +399,25 @@ class BaseAPI(ABC):
             self.logger.error(error_msg)
             raise APIException(error_msg)
     
+    def _cached_response(self, url: str, **kwargs) -> Optional[requests.Response]:
+        """
+        Look up a GET in the HTTP cache without sending it
+        
+        Returns:
+            The cached response if a fresh one exists, otherwise None
+        """
+        try:
+            # only_if_cached answers a miss (or an expired entry) with a synthetic 504
+            response = self.session.request(
+                "GET", url, timeout=self.config.timeout, only_if_cached=True, **kwargs
+            )
+        except requests.exceptions.RequestException:
+            return None
+        
+        if getattr(response, "from_cache", False) and response.status_code < 400:
+            return response
+        return None
+    
     def _should_add_api_key_to_params(self) -> bool:
         """
         Check if API key should be added to request parameters
@@ -326,6 +455,16 @@ class BaseAPI(ABC):
             "Accept": "application/json"
         }
     
+    @staticmethod
+    def _parse_json(response: requests.Response) -> Any:
+        """
+        Decode a JSON response body with orjson
+        
+        Parses the raw bytes directly, skipping the str decode that
+        response.json() goes through.
+        """
+        return orjson.loads(response.content)
+    
     def get(self, url: str, **kwargs) -> requests.Response:
         """Make a GET request"""
         return self._make_request("GET", url, **kwargs)
@@ -393,9 +532,7 @@ def rate_limited(func: Callable[..., T]) -> Callable[..., T]:
     def wrapper(self, *args, **kwargs) -> T:
         if hasattr(self, 'rate_limiter'):
             self.rate_limiter.wait_if_needed()
-            result = func(self, *args, **kwargs)
-            self.rate_limiter.record_call()
-            return result
+            return func(self, *args, **kwargs)
         else:
             # If no rate limiter, just call the function
             return func(self, *args, **kwargs)
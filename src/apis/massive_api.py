@@ -5,12 +5,40 @@ Provides methods for accessing Massive.com reference data including
 US stock tickers, company information, and market data.
 """
 
-from typing import Optional, Dict, Any, List
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from cachetools import TTLCache
 
+from src.config.settings import APIConfig
 from .base_api import BaseAPI
 
 
+# Fields of a /reference/tickers result, in file column order. Declared up front so
+# streamed pages share one schema regardless of which fields the first row carries.
+TICKER_SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("name", pa.string()),
+    ("market", pa.string()),
+    ("locale", pa.string()),
+    ("primary_exchange", pa.string()),
+    ("type", pa.string()),
+    ("active", pa.bool_()),
+    ("currency_name", pa.string()),
+    ("currency_symbol", pa.string()),
+    ("base_currency_name", pa.string()),
+    ("base_currency_symbol", pa.string()),
+    ("cik", pa.string()),
+    ("composite_figi", pa.string()),
+    ("share_class_figi", pa.string()),
+    ("last_updated_utc", pa.string()),
+    ("delisted_utc", pa.string()),
+])
+
+
 class MassiveApi(BaseAPI):
     """
     Massive.com API client
@@ -21,6 +49,27 @@ class MassiveApi(BaseAPI):
     - Market reference data
     """
     
+    # Reference data changes slowly; re-runs within the window skip the network
+    cache_expire_after = timedelta(hours=6)
+    cache_urls_expire_after = {"*/reference/tickers/*": timedelta(days=7)}
+    
+    def __init__(
+        self,
+        config: APIConfig,
+        details_cache_ttl: int = 24 * 60 * 60,
+        cache_dir: Optional[Path] = None
+    ):
+        """
+        Initialize Massive API client
+        
+        Args:
+            config: API configuration
+            details_cache_ttl: Seconds to keep ticker details cached (ticker metadata is near-static)
+            cache_dir: Directory for the HTTP response cache (defaults to {DATA_ROOT_DIR}/.cache)
+        """
+        super().__init__(config, cache_dir=cache_dir)
+        self._ticker_details_cache: TTLCache = TTLCache(maxsize=4096, ttl=details_cache_ttl)
+    
     def _get_api_key_params(self) -> Dict[str, str]:
         """Massive uses 'apiKey' parameter"""
         return {"apiKey": self.config.api_key}
@@ -41,7 +90,7 @@ class MassiveApi(BaseAPI):
                     "limit": "1"
                 }
             )
-            data = response.json()
+            data = self._parse_json(response)
             return "results" in data
         except Exception as e:
             self.logger.error(f"Connection test failed: {e}")
@@ -70,8 +119,8 @@ class MassiveApi(BaseAPI):
         """
         params = {
             "market": market,
-            "active": str(active).lower(),
-            "limit": str(limit),
+            "active": "true" if active else "false",
+            "limit": limit,
             "sort": sort,
             "order": order
         }
@@ -80,107 +129,112 @@ class MassiveApi(BaseAPI):
             f"{self.config.base_url}/reference/tickers",
             params=params
         )
-        return response.json()
+        return self._parse_json(response)
     
-    def get_all_tickers(
+    def iter_ticker_pages(
         self,
         market: str = "stocks",
         active: bool = True,
         max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Get all tickers with automatic pagination
+        Iterate over ticker pages, following pagination as each page is consumed
         
         Args:
             market: Market type (stocks, crypto, fx)
             active: Filter for active/tradable tickers only
             max_pages: Maximum number of pages to fetch (None = all)
             
-        Returns:
-            List of all ticker dictionaries
+        Yields:
+            List of ticker dictionaries for each page
         """
-        all_tickers = []
+        total = 0
         page = 1
         next_url = None
         
         self.logger.info(f"Fetching all {market} tickers...")
         
-        while True:
-            if max_pages and page > max_pages:
-                self.logger.info(f"Reached maximum pages limit: {max_pages}")
-                break
-            
+        while not max_pages or page <= max_pages:
             try:
-                if next_url:
-                    # Use pagination URL
-                    self.logger.debug(f"Fetching page {page} (using next_url)...")
-                    # Extract path from next_url
-                    if next_url.startswith('http'):
-                        # Full URL provided
-                        response = self.get(next_url)
-                    else:
-                        # Relative URL
-                        response = self.get(f"{self.config.base_url}{next_url}")
-                else:
+                if next_url is None:
                     # First page
-                    self.logger.debug(f"Fetching page {page}...")
+                    self.logger.debug("Fetching page %d...", page)
                     data = self.get_tickers(market=market, active=active, limit=1000)
-                    
-                    results = data.get('results', [])
-                    next_url = data.get('next_url')
-                    
-                    self.logger.info(
-                        f"Page {page}: Received {len(results)} tickers "
-                        f"(total so far: {len(all_tickers) + len(results)})"
-                    )
-                    
-                    all_tickers.extend(results)
-                    
-                    if not next_url or len(results) == 0:
-                        break
-                    
-                    page += 1
-                    continue
-                
-                # Parse response for pagination
-                data = response.json()
-                results = data.get('results', [])
-                next_url = data.get('next_url')
-                
-                self.logger.info(
-                    f"Page {page}: Received {len(results)} tickers "
-                    f"(total so far: {len(all_tickers) + len(results)})"
-                )
-                
-                all_tickers.extend(results)
-                
-                if not next_url or len(results) == 0:
-                    break
-                
-                page += 1
-                
+                else:
+                    # Pagination URL may be absolute or relative to the base URL
+                    self.logger.debug("Fetching page %d (using next_url)...", page)
+                    url = next_url if next_url.startswith('http') else f"{self.config.base_url}{next_url}"
+                    data = self._parse_json(self.get(url))
             except Exception as e:
                 self.logger.error(f"Error fetching page {page}: {e}")
                 break
+            
+            results = data.get('results', [])
+            next_url = data.get('next_url')
+            total += len(results)
+            
+            self.logger.info(
+                "Page %d: Received %d tickers (total so far: %d)",
+                page, len(results), total
+            )
+            
+            yield results
+            
+            if not next_url or len(results) == 0:
+                break
+            
+            page += 1
+        else:
+            self.logger.info(f"Reached maximum pages limit: {max_pages}")
+        
+        self.logger.info(f"Completed! Fetched {total} total tickers")
+    
+    def get_all_tickers(
+        self,
+        market: str = "stocks",
+        active: bool = True,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all tickers with automatic pagination
         
-        self.logger.info(f"Completed! Fetched {len(all_tickers)} total tickers")
+        Args:
+            market: Market type (stocks, crypto, fx)
+            active: Filter for active/tradable tickers only
+            max_pages: Maximum number of pages to fetch (None = all)
+            
+        Returns:
+            List of all ticker dictionaries
+        """
+        all_tickers = []
+        for results in self.iter_ticker_pages(market=market, active=active, max_pages=max_pages):
+            all_tickers.extend(results)
         return all_tickers
     
     def get_ticker_details(self, ticker: str) -> Dict[str, Any]:
         """
         Get detailed information for a specific ticker
         
+        Successful responses are cached per ticker for details_cache_ttl seconds.
+        
         Args:
             ticker: Stock ticker symbol
             
         Returns:
             Dictionary with detailed ticker information
         """
+        ticker = ticker.upper()
+        cached = self._ticker_details_cache.get(ticker)
+        if cached is not None:
+            return cached
+        
         try:
             response = self.get(
                 f"{self.config.base_url}/reference/tickers/{ticker}"
             )
-            return response.json()
+            details = self._parse_json(response)
+            self._ticker_details_cache[ticker] = details
+            return details
         except Exception as e:
             self.logger.error(f"Error getting details for {ticker}: {e}")
             return {}
@@ -206,8 +260,8 @@ class MassiveApi(BaseAPI):
         """
         params = {
             "search": query,
-            "active": str(active).lower(),
-            "limit": str(limit)
+            "active": "true" if active else "false",
+            "limit": limit
         }
         
         if market:
@@ -218,7 +272,7 @@ class MassiveApi(BaseAPI):
                 f"{self.config.base_url}/reference/tickers",
                 params=params
             )
-            data = response.json()
+            data = self._parse_json(response)
             return data.get('results', [])
         except Exception as e:
             self.logger.error(f"Error searching for '{query}': {e}")
@@ -230,7 +284,7 @@ class MassiveApi(BaseAPI):
         include_columns: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
-        Convert ticker list to pandas DataFrame
+        Convert ticker list to an Arrow-backed pandas DataFrame
         
         Args:
             tickers: List of ticker dictionaries
@@ -242,14 +296,15 @@ class MassiveApi(BaseAPI):
         if not tickers:
             return pd.DataFrame()
         
-        df = pd.DataFrame(tickers)
+        # pa.array infers the struct type from every row, so optional fields
+        # (cik, composite_figi, ...) survive even when the first ticker lacks them
+        table = pa.Table.from_struct_array(pa.array(tickers))
         
         if include_columns:
-            # Only keep specified columns that exist
-            existing_cols = [col for col in include_columns if col in df.columns]
-            df = df[existing_cols]
+            # Only keep specified columns that exist, before anything reaches pandas
+            table = table.select([col for col in include_columns if col in table.column_names])
         
-        return df
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
     
     def save_tickers_to_parquet(
         self,
@@ -258,7 +313,10 @@ class MassiveApi(BaseAPI):
         active: bool = True
     ) -> int:
         """
-        Fetch all tickers and save to parquet file
+        Fetch all tickers and stream them to a parquet file, one row group per page
+        
+        Only one page is held in memory at a time. Every page is written with
+        TICKER_SCHEMA: missing fields become nulls and fields outside it are dropped.
         
         Args:
             filepath: Output file path
@@ -268,14 +326,28 @@ class MassiveApi(BaseAPI):
         Returns:
             Number of tickers saved
         """
-        tickers = self.get_all_tickers(market=market, active=active)
+        writer = None
+        count = 0
         
-        if not tickers:
+        try:
+            for results in self.iter_ticker_pages(market=market, active=active):
+                if not results:
+                    continue
+                
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        filepath, TICKER_SCHEMA, compression='zstd', compression_level=3
+                    )
+                
+                writer.write_table(pa.Table.from_pylist(results, schema=TICKER_SCHEMA))
+                count += len(results)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if not count:
             self.logger.warning("No tickers to save")
             return 0
         
-        df = self.to_dataframe(tickers)
-        df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
-        
-        self.logger.info(f"Saved {len(tickers)} tickers to {filepath}")
-        return len(tickers)
+        self.logger.info(f"Saved {count} tickers to {filepath}")
+        return count
@@ -0,0 +1,141 @@
+"""
+Async Yahoo Finance chart downloads
+
+Fetches price bars for many tickers concurrently from Yahoo's v8 chart
+endpoint over one pooled aiohttp session, instead of yfinance's blocking
+per-ticker requests.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+import aiohttp
+import orjson
+import pandas as pd
+
+from .yahoo_finance_api import format_intraday_frame
+
+
+YAHOO_CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{ticker}"
+
+# Intervals whose bars are dated rather than timestamped (matches yfinance's index name)
+_DAILY_INTERVALS = {"1d", "5d", "1wk", "1mo", "3mo"}
+
+logger = logging.getLogger(__name__)
+
+
+async def _fetch_chart(
+    session: aiohttp.ClientSession,
+    ticker: str,
+    period: str,
+    interval: str
+) -> Optional[pd.DataFrame]:
+    """
+    Fetch one ticker's chart and shape it like YahooFinanceApi.get_intraday_data
+
+    Args:
+        session: Open aiohttp session
+        ticker: Stock ticker symbol
+        period: Time period (1d, 5d, 1mo, ...)
+        interval: Data interval (1m, 5m, 1h, 1d, ...)
+
+    Returns:
+        DataFrame with price data or None if no data was returned
+    """
+    async with session.get(
+        YAHOO_CHART_URL.format(ticker=ticker),
+        params={"range": period, "interval": interval}
+    ) as response:
+        if response.status != 200:
+            logger.warning(f"Chart request for {ticker} failed with status {response.status}")
+            return None
+        payload = orjson.loads(await response.read())
+
+    results = (payload.get("chart") or {}).get("result") or []
+    if not results or not results[0].get("timestamp"):
+        logger.warning(f"No data available for {ticker}")
+        return None
+
+    result = results[0]
+    quote = result["indicators"]["quote"][0]
+
+    index = pd.to_datetime(result["timestamp"], unit="s", utc=True)
+    timezone = result.get("meta", {}).get("exchangeTimezoneName")
+    if timezone:
+        index = index.tz_convert(timezone)
+    index.name = "Date" if interval in _DAILY_INTERVALS else "Datetime"
+
+    df = pd.DataFrame(
+        {
+            "Open": quote.get("open"),
+            "High": quote.get("high"),
+            "Low": quote.get("low"),
+            "Close": quote.get("close"),
+            "Volume": quote.get("volume"),
+        },
+        index=index
+    )
+    # Yahoo pads gaps (e.g. halted minutes) with nulls
+    df = df.dropna(subset=["Open", "High", "Low", "Close"], how="all")
+    if df.empty:
+        logger.warning(f"No data available for {ticker}")
+        return None
+
+    return format_intraday_frame(df, ticker)
+
+
+async def aget_multiple_tickers(
+    tickers: List[str],
+    period: str = "1d",
+    interval: str = "1m",
+    concurrency: int = 16
+) -> Dict[str, pd.DataFrame]:
+    """
+    Get price data for multiple tickers concurrently
+
+    Args:
+        tickers: List of ticker symbols
+        period: Time period
+        interval: Data interval
+        concurrency: Maximum requests in flight (and pooled connections)
+
+    Returns:
+        Dictionary mapping ticker to DataFrame
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+
+    async def fetch(session: aiohttp.ClientSession, ticker: str) -> Tuple[str, Optional[pd.DataFrame]]:
+        async with semaphore:
+            try:
+                return ticker, await _fetch_chart(session, ticker, period, interval)
+            # ValueError covers orjson.JSONDecodeError; TypeError a null indicators entry.
+            # Anything escaping here would fail the whole gather, so keep it per ticker
+            except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, IndexError,
+                    ValueError, TypeError) as e:
+                logger.error(f"Error collecting data for {ticker}: {e}")
+                return ticker, None
+
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": "Stox/1.0 (YahooFinance)", "Accept": "application/json"},
+        timeout=aiohttp.ClientTimeout(total=30)
+    ) as session:
+        pairs = await asyncio.gather(*(fetch(session, ticker) for ticker in tickers))
+
+    return {ticker: df for ticker, df in pairs if df is not None}
+
+
+def get_multiple_tickers_async(
+    tickers: List[str],
+    period: str = "1d",
+    interval: str = "1m",
+    concurrency: int = 16
+) -> Dict[str, pd.DataFrame]:
+    """
+    Synchronous wrapper around aget_multiple_tickers
+
+    Must not be called from inside a running event loop; await
+    aget_multiple_tickers directly there instead.
+    """
+    return asyncio.run(aget_multiple_tickers(tickers, period, interval, concurrency))
@@ -5,12 +5,100 @@ Provides methods for accessing Yahoo Finance data including
 intraday price data, top gainers/losers, and stock information.
 """
 
-from typing import Optional, Dict, Any, List
-import pandas as pd
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from datetime import datetime
 
+from src.config.settings import APIConfig
 from .base_api import BaseAPI
+from ._cache import FileCache, cached
+
+# pandas and yfinance are slow to import, so they are loaded on first use
+if TYPE_CHECKING:
+    import pandas as pd
+    import yfinance as yf
+
+
+# yfinance column names -> snake_case; columns not listed are left as-is
+_YF_COLUMN_RENAME = {
+    "Date": "date",
+    "Datetime": "datetime",
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Adj Close": "adj_close",
+    "Volume": "volume",
+    "Dividends": "dividends",
+    "Stock Splits": "stock_splits",
+    "Capital Gains": "capital_gains",
+}
+
+# Price-valued columns of get_intraday_data that dtype_narrow casts to float32
+_PRICE_COLUMNS = [
+    "open", "high", "low", "close",
+    "price_change", "price_change_pct", "high_low_spread", "high_low_spread_pct",
+]
+
+
+@lru_cache(maxsize=1024)
+def _get_ticker(symbol: str) -> "yf.Ticker":
+    """
+    Get a shared yf.Ticker for a symbol
+    
+    Reusing instances keeps the state yfinance fetches lazily (cookie/crumb,
+    metadata) across calls instead of rebuilding it per method.
+    """
+    import yfinance as yf
+    
+    return yf.Ticker(symbol)
+
+
+def clear_ticker_cache() -> None:
+    """Drop all memoized yf.Ticker instances"""
+    _get_ticker.cache_clear()
+
+
+def format_intraday_frame(df: "pd.DataFrame", ticker: str) -> "pd.DataFrame":
+    """
+    Normalize a yfinance-style OHLCV frame and add derived price metrics
+    
+    Shared by YahooFinanceApi and the async chart downloader so every path
+    returns frames of the same shape.
+    
+    Args:
+        df: Raw yfinance frame indexed by datetime
+        ticker: Stock ticker symbol
+        
+    Returns:
+        Frame with a datetime column, lowercase column names, a ticker
+        column, and price change / spread metrics
+    """
+    # Add ticker column
+    df['ticker'] = ticker
+    
+    # Reset index to make datetime a column
+    df.reset_index(inplace=True)
+    
+    # Rename columns to lowercase
+    df.rename(columns=_YF_COLUMN_RENAME, inplace=True)
+    
+    # Calculate additional metrics on the raw arrays, skipping Series index alignment
+    open_ = df['open'].to_numpy()
+    close = df['close'].to_numpy()
+    high = df['high'].to_numpy()
+    low = df['low'].to_numpy()
+    price_change = close - open_
+    high_low_spread = high - low
+    df['price_change'] = price_change
+    df['price_change_pct'] = price_change / open_ * 100.0
+    df['high_low_spread'] = high_low_spread
+    df['high_low_spread_pct'] = high_low_spread / low * 100.0
+    
+    # Each assignment above adds its own block; copy() consolidates the
+    # float columns into one block so column reductions scan contiguous memory
+    return df.copy()
 
 
 class YahooFinanceApi(BaseAPI):
@@ -27,6 +115,18 @@ class YahooFinanceApi(BaseAPI):
     library is used for data access
     """
     
+    def __init__(self, config: APIConfig, cache: Optional[FileCache] = None):
+        """
+        Initialize Yahoo Finance client
+        
+        Args:
+            config: API configuration
+            cache: Optional file cache for price data and ticker info,
+                e.g. FileCache.from_config(settings.data, "yahoo")
+        """
+        super().__init__(config)
+        self.cache = cache
+    
     def _should_add_api_key_to_params(self) -> bool:
         """Yahoo Finance doesn't use API key in params"""
         return False
@@ -39,7 +139,7 @@ class YahooFinanceApi(BaseAPI):
             True if connection successful, False otherwise
         """
         try:
-            ticker = yf.Ticker("AAPL")
+            ticker = _get_ticker("AAPL")
             info = ticker.info
             return 'symbol' in info or 'shortName' in info
         except Exception as e:
@@ -56,35 +156,7 @@ class YahooFinanceApi(BaseAPI):
         Returns:
             List of dictionaries with gainer information
         """
-        try:
-            self.logger.info(f"Fetching top {count} gainers...")
-            
-            # Use yfinance screener
-            response = yf.screen('day_gainers', count=count)
-            
-            gainers = []
-            if response and 'quotes' in response:
-                for quote in response['quotes']:
-                    ticker = quote.get('symbol', '')
-                    pct_change = quote.get('regularMarketChangePercent', 0)
-                    volume = quote.get('regularMarketVolume', 0)
-                    price = quote.get('regularMarketPrice', 0)
-                    
-                    if ticker and pct_change:
-                        gainers.append({
-                            'ticker': ticker,
-                            'pct_change': round(pct_change, 2),
-                            'volume': volume,
-                            'current_price': price
-                        })
-                
-                self.logger.info(f"Found {len(gainers)} top gainers")
-            
-            return gainers
-            
-        except Exception as e:
-            self.logger.error(f"Error getting top gainers: {e}")
-            return []
+        return self._get_movers('day_gainers', count, 'gainers')
     
     def get_top_losers(self, count: int = 20) -> List[Dict[str, Any]]:
         """
@@ -96,41 +168,79 @@ class YahooFinanceApi(BaseAPI):
         Returns:
             List of dictionaries with loser information
         """
+        return self._get_movers('day_losers', count, 'losers')
+    
+    def _get_movers(self, screener: str, count: int, label: str) -> List[Dict[str, Any]]:
+        """
+        Run a predefined yfinance screener and extract its movers
+        
+        Args:
+            screener: Screener name (e.g., 'day_gainers', 'day_losers')
+            count: Number of quotes to fetch
+            label: Noun used in log messages (e.g., 'gainers')
+            
+        Returns:
+            List of dictionaries with mover information
+        """
+        import yfinance as yf
+        
         try:
-            self.logger.info(f"Fetching top {count} losers...")
+            self.logger.info(f"Fetching top {count} {label}...")
             
-            response = yf.screen('day_losers', count=count)
+            # Use yfinance screener
+            response = yf.screen(screener, count=count)
             
-            losers = []
-            if response and 'quotes' in response:
-                for quote in response['quotes']:
-                    ticker = quote.get('symbol', '')
-                    pct_change = quote.get('regularMarketChangePercent', 0)
-                    volume = quote.get('regularMarketVolume', 0)
-                    price = quote.get('regularMarketPrice', 0)
-                    
-                    if ticker and pct_change:
-                        losers.append({
-                            'ticker': ticker,
-                            'pct_change': round(pct_change, 2),
-                            'volume': volume,
-                            'current_price': price
-                        })
-                
-                self.logger.info(f"Found {len(losers)} top losers")
+            movers = self._extract_movers(response)
+            self.logger.info(f"Found {len(movers)} top {label}")
             
-            return losers
+            return movers
             
         except Exception as e:
-            self.logger.error(f"Error getting top losers: {e}")
+            self.logger.error(f"Error getting top {label}: {e}")
+            return []
+    
+    @staticmethod
+    def _extract_movers(response: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract ticker, change, volume and price from a screener response
+        
+        Args:
+            response: yf.screen response
+            
+        Returns:
+            List of dictionaries for quotes with a symbol and a non-zero change
+        """
+        quotes = response.get('quotes', []) if response else []
+        if not quotes:
             return []
+        
+        import pandas as pd
+        
+        df = pd.DataFrame(quotes, columns=[
+            'symbol', 'regularMarketChangePercent', 'regularMarketVolume', 'regularMarketPrice'
+        ])
+        df = df[
+            df['symbol'].fillna('').astype(bool)
+            & df['regularMarketChangePercent'].fillna(0).ne(0)
+        ]
+        
+        return pd.DataFrame({
+            'ticker': df['symbol'],
+            'pct_change': df['regularMarketChangePercent'].round(2),
+            'volume': df['regularMarketVolume'].fillna(0).astype('int64'),
+            'current_price': df['regularMarketPrice'].fillna(0)
+        }).to_dict('records')
     
+    # Intraday periods include the live session, so cached bars go stale within minutes
+    @cached("intraday", ttl_hours=5 / 60)
     def get_intraday_data(
         self,
         ticker: str,
         period: str = "5d",
-        interval: str = "1m"
-    ) -> Optional[pd.DataFrame]:
+        interval: str = "1m",
+        dtype_backend: Optional[str] = None,
+        dtype_narrow: bool = False
+    ) -> Optional["pd.DataFrame"]:
         """
         Get intraday price data for a ticker
         
@@ -138,34 +248,35 @@ class YahooFinanceApi(BaseAPI):
             ticker: Stock ticker symbol
             period: Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
             interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+            dtype_backend: "pyarrow" to return Arrow-backed columns (e.g. when
+                settings.data.default_format is "parquet"), None for NumPy dtypes
+            dtype_narrow: Store price columns as float32 (~7 significant digits)
+                to halve their memory; leave False when aggregating at float64 precision
             
         Returns:
             DataFrame with intraday data or None if failed
+            
+        Raises:
+            ValueError: If dtype_backend is not None or "pyarrow"
         """
+        if dtype_backend not in (None, "pyarrow"):
+            raise ValueError(f"Unsupported dtype_backend: {dtype_backend}")
+        
         try:
             self.logger.info(f"Collecting {interval} data for {ticker} (period: {period})...")
             
-            stock = yf.Ticker(ticker)
+            stock = _get_ticker(ticker)
             df = stock.history(period=period, interval=interval)
             
             if df.empty:
                 self.logger.warning(f"No data available for {ticker}")
                 return None
             
-            # Add ticker column
-            df['ticker'] = ticker
-            
-            # Reset index to make datetime a column
-            df.reset_index(inplace=True)
-            
-            # Rename columns to lowercase
-            df.columns = [col.lower().replace(' ', '_') for col in df.columns]
-            
-            # Calculate additional metrics
-            df['price_change'] = df['close'] - df['open']
-            df['price_change_pct'] = (df['price_change'] / df['open']) * 100
-            df['high_low_spread'] = df['high'] - df['low']
-            df['high_low_spread_pct'] = (df['high_low_spread'] / df['low']) * 100
+            df = format_intraday_frame(df, ticker)
+            if dtype_narrow:
+                df[_PRICE_COLUMNS] = df[_PRICE_COLUMNS].astype("float32")
+            if dtype_backend == "pyarrow":
+                df = self._to_arrow_dtypes(df)
             
             self.logger.info(f"Collected {len(df)} {interval} bars for {ticker}")
             return df
@@ -174,13 +285,28 @@ class YahooFinanceApi(BaseAPI):
             self.logger.error(f"Error collecting data for {ticker}: {e}")
             return None
     
+    @staticmethod
+    def _to_arrow_dtypes(df: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Convert a frame to pyarrow-backed dtypes, keeping each column's type
+        
+        Unlike convert_dtypes(dtype_backend="pyarrow"), this never turns
+        whole-number price columns into integers. Parquet writes of the
+        result skip the pandas -> Arrow conversion.
+        """
+        import pandas as pd
+        import pyarrow as pa
+        
+        return pa.Table.from_pandas(df, preserve_index=False).to_pandas(types_mapper=pd.ArrowDtype)
+    
+    @cached("historical")
     def get_historical_data(
         self,
         ticker: str,
         start: Optional[str] = None,
         end: Optional[str] = None,
         period: str = "max"
-    ) -> Optional[pd.DataFrame]:
+    ) -> Optional["pd.DataFrame"]:
         """
         Get historical daily price data
         
@@ -194,7 +320,7 @@ class YahooFinanceApi(BaseAPI):
             DataFrame with historical data or None if failed
         """
         try:
-            stock = yf.Ticker(ticker)
+            stock = _get_ticker(ticker)
             
             if start and end:
                 df = stock.history(start=start, end=end)
@@ -207,7 +333,7 @@ class YahooFinanceApi(BaseAPI):
             
             df['ticker'] = ticker
             df.reset_index(inplace=True)
-            df.columns = [col.lower().replace(' ', '_') for col in df.columns]
+            df.rename(columns=_YF_COLUMN_RENAME, inplace=True)
             
             return df
             
@@ -215,6 +341,7 @@ class YahooFinanceApi(BaseAPI):
             self.logger.error(f"Error getting historical data for {ticker}: {e}")
             return None
     
+    @cached("info", ttl_hours=24, cache_subdir="ticker_info", serializer="json", serve_stale=True)
     def get_ticker_info(self, ticker: str) -> Dict[str, Any]:
         """
         Get detailed information about a ticker
@@ -226,7 +353,7 @@ class YahooFinanceApi(BaseAPI):
             Dictionary with ticker information
         """
         try:
-            stock = yf.Ticker(ticker)
+            stock = _get_ticker(ticker)
             return stock.info
         except Exception as e:
             self.logger.error(f"Error getting info for {ticker}: {e}")
@@ -236,28 +363,163 @@ class YahooFinanceApi(BaseAPI):
         self,
         tickers: List[str],
         period: str = "1d",
-        interval: str = "1m"
-    ) -> Dict[str, pd.DataFrame]:
+        interval: str = "1m",
+        max_workers: int = 8,
+        bulk: bool = True
+    ) -> Dict[str, "pd.DataFrame"]:
         """
         Get data for multiple tickers at once
         
+        With bulk=True (the default) and more than one ticker, this delegates
+        to get_multiple_tickers_bulk: max_workers is ignored and the FileCache
+        is bypassed. Pass bulk=False for per-ticker get_intraday_data calls,
+        which use max_workers and the cache.
+        
+        Args:
+            tickers: List of ticker symbols
+            period: Time period
+            interval: Data interval
+            max_workers: Concurrent fetches when bulk=False (1 = sequential, useful for debugging)
+            bulk: Use batched yf.download requests when fetching more than one ticker
+            
+        Returns:
+            Dictionary mapping ticker to DataFrame
+        """
+        if bulk and len(tickers) > 1:
+            return self.get_multiple_tickers_bulk(tickers, period, interval)
+        
+        results = {}
+        
+        if max_workers <= 1:
+            for ticker in tickers:
+                df = self.get_intraday_data(ticker, period, interval)
+                if df is not None:
+                    results[ticker] = df
+            return results
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.get_intraday_data, ticker, period, interval): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error collecting data for {ticker}: {e}")
+                    continue
+                if df is not None:
+                    results[ticker] = df
+        
+        return results
+    
+    def get_multiple_tickers_bulk(
+        self,
+        tickers: List[str],
+        period: str = "1d",
+        interval: str = "1m",
+        batch_size: int = 20
+    ) -> Dict[str, "pd.DataFrame"]:
+        """
+        Get data for multiple tickers using one yf.download request per batch
+        
+        Collapses N per-ticker history() calls into ceil(N / batch_size)
+        downloads, then splits the result back into per-ticker frames shaped
+        like get_intraday_data's output.
+        
         Args:
             tickers: List of ticker symbols
             period: Time period
             interval: Data interval
+            batch_size: Tickers per download request
             
         Returns:
             Dictionary mapping ticker to DataFrame
         """
+        combined = self.get_intraday_batch(tickers, period, interval, chunk_size=batch_size)
         results = {}
         
+        if combined.empty:
+            return results
+        
+        downloaded = set(combined.columns.get_level_values(0))
         for ticker in tickers:
-            df = self.get_intraday_data(ticker, period, interval)
-            if df is not None:
-                results[ticker] = df
+            if ticker not in downloaded:
+                self.logger.warning(f"No data available for {ticker}")
+                continue
+            
+            # Batches share an index, so drop rows where this ticker didn't trade
+            df = combined.xs(ticker, axis=1, level=0)
+            df = df.dropna(subset=['Open', 'High', 'Low', 'Close'], how='all')
+            if df.empty:
+                self.logger.warning(f"No data available for {ticker}")
+                continue
+            
+            df = df.copy()
+            df.columns.name = None
+            # history() reports no action as 0, not NaN
+            actions = df.columns.intersection(['Dividends', 'Stock Splits', 'Capital Gains'])
+            df[actions] = df[actions].fillna(0)
+            results[ticker] = format_intraday_frame(df, ticker)
         
         return results
     
+    def get_intraday_batch(
+        self,
+        tickers: List[str],
+        period: str = "1d",
+        interval: str = "1m",
+        chunk_size: Optional[int] = None
+    ) -> "pd.DataFrame":
+        """
+        Get intraday data for many tickers with bulk yf.download calls
+        
+        yfinance fetches each chunk with its own thread pool, and every chunk
+        counts as one call against the rate limiter.
+        
+        Args:
+            tickers: List of ticker symbols
+            period: Time period
+            interval: Data interval
+            chunk_size: Tickers per download (defaults to calls_per_minute)
+            
+        Returns:
+            DataFrame with (ticker, field) MultiIndex columns, or an empty
+            DataFrame if nothing was downloaded
+        """
+        import pandas as pd
+        import yfinance as yf
+        
+        chunk_size = chunk_size or self.config.rate_limit.calls_per_minute
+        frames = []
+        
+        for start in range(0, len(tickers), chunk_size):
+            chunk = tickers[start:start + chunk_size]
+            # Reserves this batch's slot in the rate limiter
+            self.rate_limiter.wait_if_needed()
+            try:
+                df = yf.download(
+                    tickers=' '.join(chunk),
+                    period=period,
+                    interval=interval,
+                    threads=True,
+                    group_by='ticker',
+                    progress=False,
+                    # Match history()'s Dividends / Stock Splits columns
+                    actions=True
+                )
+            except Exception as e:
+                self.logger.error(f"Error downloading batch starting at {chunk[0]}: {e}")
+                continue
+            
+            if not df.empty:
+                frames.append(df)
+        
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+    
     def download(
         self,
         tickers: str,
@@ -266,7 +528,7 @@ class YahooFinanceApi(BaseAPI):
         period: str = "max",
         interval: str = "1d",
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """
         Download data using yfinance.download (bulk download)
         
@@ -281,6 +543,9 @@ class YahooFinanceApi(BaseAPI):
         Returns:
             DataFrame with data for all tickers
         """
+        import pandas as pd
+        import yfinance as yf
+        
         try:
             df = yf.download(
                 tickers=tickers,
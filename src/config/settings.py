@@ -5,13 +5,79 @@ Handles API keys, rate limits, and environment-specific settings with validation
 """
 
 import os
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
+from typing import Optional, Dict, Any, Mapping
+from dotenv import find_dotenv, load_dotenv
 
 
-@dataclass
+_VALID_LEVELS: frozenset[str] = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+_VALID_FORMATS: frozenset[str] = frozenset({"parquet", "csv", "json"})
+
+# {API_NAME}_{FIELD} environment variables read by Settings._load_api_config
+_API_ENV_RE = re.compile(
+    r"^([A-Za-z0-9_]+?)_"
+    r"(API_KEY|BASE_URL|CALLS_PER_MINUTE|CALLS_PER_DAY|MIN_DELAY|TIMEOUT|MAX_RETRIES|ENABLED)$"
+)
+
+# Numeric {API_NAME}_{FIELD} variables: field -> (defaults key, converter, fallback)
+_API_NUMERIC_FIELDS = {
+    "CALLS_PER_MINUTE": ("calls_per_minute", int, 60),
+    "CALLS_PER_DAY": ("calls_per_day", int, 0),
+    "MIN_DELAY": ("min_delay_seconds", float, 0.5),
+    "TIMEOUT": ("timeout", int, 30),
+    "MAX_RETRIES": ("max_retries", int, 3),
+}
+
+
+def _group_api_env(env: Mapping[str, str]) -> Dict[str, Dict[str, str]]:
+    """
+    Group API environment variables by prefix in one pass
+    
+    Args:
+        env: Environment snapshot
+        
+    Returns:
+        Mapping of API prefix to {field: value}, e.g.
+        {"MASSIVE": {"API_KEY": "...", "BASE_URL": "..."}}
+    """
+    api_envs: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for key, value in env.items():
+        match = _API_ENV_RE.match(key)
+        if match:
+            api_envs[match.group(1)][match.group(2)] = value
+    return api_envs
+
+
+@lru_cache(maxsize=8)
+def _dotenv_cached(path: str, mtime: float) -> bool:
+    """Load a .env file once per (path, mtime) so unchanged files aren't re-read"""
+    return load_dotenv(path)
+
+
+def _load_dotenv(env_file: Optional[str] = None) -> None:
+    """
+    Load a .env file into os.environ, skipping it if already loaded unchanged
+    
+    Args:
+        env_file: Path to .env file (searched for like load_dotenv() if omitted)
+    """
+    path = env_file or find_dotenv()
+    if not path:
+        return
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return
+    _dotenv_cached(path, mtime)
+
+
+@dataclass(slots=True, frozen=True)
 class RateLimitConfig:
     """Rate limiting configuration for API calls"""
     
@@ -29,7 +95,7 @@ class RateLimitConfig:
             raise ValueError("min_delay_seconds must be non-negative")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class APIConfig:
     """Configuration for a specific API"""
     
@@ -58,7 +124,7 @@ class APIConfig:
             raise ValueError("retry_delay must be non-negative")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DataConfig:
     """Configuration for data storage and management"""
     
@@ -72,10 +138,11 @@ class DataConfig:
     def __post_init__(self):
         """Validate data configuration"""
         if not isinstance(self.root_dir, Path):
-            self.root_dir = Path(self.root_dir)
+            # Frozen dataclass: bypass __setattr__ for the one-time coercion
+            object.__setattr__(self, "root_dir", Path(self.root_dir))
         if self.cache_ttl_hours < 0:
             raise ValueError("cache_ttl_hours must be non-negative")
-        if self.default_format not in ["parquet", "csv", "json"]:
+        if self.default_format not in _VALID_FORMATS:
             raise ValueError("default_format must be one of: parquet, csv, json")
 
 
@@ -116,6 +183,7 @@ class Settings:
     def _load_api_config(
         cls,
         api_name: str,
+        fields: Mapping[str, str],
         required: bool = True,
         defaults: Optional[Dict[str, Any]] = None
     ) -> Optional[APIConfig]:
@@ -134,6 +202,8 @@ class Settings:
         
         Args:
             api_name: Name of the API (e.g., 'ALPHAVANTAGE', 'YAHOO', 'MASSIVE')
+            fields: This API's variables keyed by field (e.g., 'API_KEY'),
+                as grouped by _group_api_env
             required: Whether this API is required (raises error if missing)
             defaults: Dictionary of default values
             
@@ -147,7 +217,7 @@ class Settings:
         prefix = api_name.upper()
         
         # Check for API key
-        api_key = os.getenv(f"{prefix}_API_KEY", defaults.get("api_key", ""))
+        api_key = fields.get("API_KEY", defaults.get("api_key", ""))
         
         if required and not api_key:
             raise ValueError(f"{prefix}_API_KEY environment variable is required")
@@ -157,23 +227,20 @@ class Settings:
             return None
         
         # Load configuration with defaults
-        base_url = os.getenv(f"{prefix}_BASE_URL", defaults.get("base_url", ""))
+        base_url = fields.get("BASE_URL", defaults.get("base_url", ""))
         if not base_url:
             raise ValueError(f"{prefix}_BASE_URL is required")
         
+        # Numeric fields in one pass: env value if set, else the API's default
+        values = {
+            key: convert(fields[field]) if field in fields else convert(defaults.get(key, fallback))
+            for field, (key, convert, fallback) in _API_NUMERIC_FIELDS.items()
+        }
+        
         rate_limit = RateLimitConfig(
-            calls_per_minute=int(os.getenv(
-                f"{prefix}_CALLS_PER_MINUTE",
-                str(defaults.get("calls_per_minute", 60))
-            )),
-            calls_per_day=int(os.getenv(
-                f"{prefix}_CALLS_PER_DAY",
-                str(defaults.get("calls_per_day", 0))
-            )) or None,  # Convert 0 to None
-            min_delay_seconds=float(os.getenv(
-                f"{prefix}_MIN_DELAY",
-                str(defaults.get("min_delay_seconds", 0.5))
-            ))
+            calls_per_minute=values["calls_per_minute"],
+            calls_per_day=values["calls_per_day"] or None,  # Convert 0 to None
+            min_delay_seconds=values["min_delay_seconds"]
         )
         
         return APIConfig(
@@ -181,16 +248,10 @@ class Settings:
             api_key=api_key,
             base_url=base_url,
             rate_limit=rate_limit,
-            timeout=int(os.getenv(
-                f"{prefix}_TIMEOUT",
-                str(defaults.get("timeout", 30))
-            )),
-            max_retries=int(os.getenv(
-                f"{prefix}_MAX_RETRIES",
-                str(defaults.get("max_retries", 3))
-            )),
-            enabled=os.getenv(
-                f"{prefix}_ENABLED",
+            timeout=values["timeout"],
+            max_retries=values["max_retries"],
+            enabled=fields.get(
+                "ENABLED",
                 str(defaults.get("enabled", True))
             ).lower() == "true"
         )
@@ -215,14 +276,13 @@ class Settings:
         Raises:
             ValueError: If required environment variables are missing or invalid
         """
-        # Load environment variables
-        if env_file:
-            load_dotenv(env_file)
-        else:
-            load_dotenv()
+        # Load environment variables, then read them from one snapshot
+        _load_dotenv(env_file)
+        env = dict(os.environ)
         
         # Dictionary to store all API configurations
         apis = {}
+        api_envs = _group_api_env(env)
         
         # Alpha Vantage configuration
         # NOTE: Free tier = 5 calls/min, 500 calls/day
@@ -230,6 +290,7 @@ class Settings:
         #       Adjust ALPHAVANTAGE_CALLS_PER_MINUTE in .env for your subscription
         alpha_vantage = cls._load_api_config(
             "ALPHAVANTAGE",
+            api_envs.get("ALPHAVANTAGE", {}),
             required=True,
             defaults={
                 "display_name": "AlphaVantage",
@@ -249,6 +310,7 @@ class Settings:
         # NOTE: No API key required, generally unlimited for personal use
         yahoo_finance = cls._load_api_config(
             "YAHOO",
+            api_envs.get("YAHOO", {}),
             required=False,  # Optional since it has no API key requirement
             defaults={
                 "display_name": "YahooFinance",
@@ -268,6 +330,7 @@ class Settings:
         # NOTE: Rate limits depend on subscription tier
         massive = cls._load_api_config(
             "MASSIVE",
+            api_envs.get("MASSIVE", {}),
             required=True,
             defaults={
                 "display_name": "Massive",
@@ -286,40 +349,38 @@ class Settings:
         # Look for any environment variables matching pattern {NAME}_API_KEY
         # that haven't been explicitly configured above
         known_apis = {"alphavantage", "yahoo", "massive"}
-        for key in os.environ:
-            if key.endswith("_API_KEY"):
-                api_prefix = key[:-8]  # Remove '_API_KEY'
-                if api_prefix.lower() not in known_apis:
-                    # Try to load this API dynamically
-                    try:
-                        config = cls._load_api_config(
-                            api_prefix,
-                            required=False,
-                            defaults={
-                                "display_name": api_prefix.replace("_", " ").title(),
-                                "base_url": os.getenv(f"{api_prefix}_BASE_URL", ""),
-                            }
-                        )
-                        if config:
-                            apis[api_prefix.lower()] = config
-                    except ValueError:
-                        # Skip if BASE_URL is missing or other validation fails
-                        pass
+        for api_prefix, fields in api_envs.items():
+            if "API_KEY" in fields and api_prefix.lower() not in known_apis:
+                # Try to load this API dynamically
+                try:
+                    config = cls._load_api_config(
+                        api_prefix,
+                        fields,
+                        required=False,
+                        defaults={
+                            "display_name": api_prefix.replace("_", " ").title(),
+                        }
+                    )
+                    if config:
+                        apis[api_prefix.lower()] = config
+                except ValueError:
+                    # Skip if BASE_URL is missing or other validation fails
+                    pass
         
         # Data configuration
-        data_root = Path(os.getenv("DATA_ROOT_DIR", "data"))
+        data_root = Path(env.get("DATA_ROOT_DIR", "data"))
         data = DataConfig(
             root_dir=data_root,
-            cache_enabled=os.getenv("CACHE_ENABLED", "true").lower() == "true",
-            cache_ttl_hours=int(os.getenv("CACHE_TTL_HOURS", "24")),
-            backup_enabled=os.getenv("BACKUP_ENABLED", "true").lower() == "true",
-            compression=os.getenv("DATA_COMPRESSION", "snappy"),
-            default_format=os.getenv("DATA_DEFAULT_FORMAT", "parquet")
+            cache_enabled=env.get("CACHE_ENABLED", "true").lower() == "true",
+            cache_ttl_hours=int(env.get("CACHE_TTL_HOURS", "24")),
+            backup_enabled=env.get("BACKUP_ENABLED", "true").lower() == "true",
+            compression=env.get("DATA_COMPRESSION", "snappy"),
+            default_format=env.get("DATA_DEFAULT_FORMAT", "parquet")
         )
         
         # Application settings
-        log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-        log_dir = Path(os.getenv("LOG_DIR", "logs"))
+        log_level = env.get("LOG_LEVEL", "INFO").upper()
+        log_dir = Path(env.get("LOG_DIR", "logs"))
         
         return cls(
             apis=apis,
@@ -336,14 +397,19 @@ class Settings:
             ValueError: If any configuration is invalid
         """
         # Validate directories exist or can be created
-        for dir_path in [self.data.root_dir, self.log_dir]:
+        def make_dir(dir_path: Path) -> None:
             try:
                 dir_path.mkdir(parents=True, exist_ok=True)
             except Exception as e:
                 raise ValueError(f"Cannot create directory {dir_path}: {e}")
         
+        # Each mkdir is a round trip on networked filesystems, so issue them concurrently
+        dirs = list(dict.fromkeys([self.data.root_dir, self.log_dir]))
+        with ThreadPoolExecutor(max_workers=len(dirs)) as executor:
+            list(executor.map(make_dir, dirs))
+        
         # Additional validation can be added here
-        if self.log_level not in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
+        if self.log_level not in _VALID_LEVELS:
             raise ValueError(
                 f"Invalid LOG_LEVEL: {self.log_level}. "
                 "Must be one of: DEBUG, INFO, WARNING, ERROR, CRITICAL"
@@ -392,6 +458,7 @@ class Settings:
 
 
 _settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
 
 
 def get_settings(reload: bool = False) -> Settings:
@@ -406,8 +473,14 @@ def get_settings(reload: bool = False) -> Settings:
     """
     global _settings
     
-    if _settings is None or reload:
-        _settings = Settings.from_env()
-        _settings.validate()
+    # Double-checked: the common already-loaded path never takes the lock
+    if _settings is not None and not reload:
+        return _settings
+    
+    with _settings_lock:
+        if _settings is None or reload:
+            settings = Settings.from_env()
+            settings.validate()
+            _settings = settings
     
     return _settings